@@ -6,14 +6,21 @@
 #   • extracts spatial datasets,
 #   • joins parcels to zoning districts,
 #   • deduplicates parcels,
-#   • saves outputs to GeoJSON and Parquet.
+#   • saves outputs to GeoJSON and Parquet,
+#   • skips outputs that are already newer than their inputs
+#     and written in the current output format.
 #
 # This script uses helper functions stored in functions.py.
 # ==========================================================================
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import geopandas as gpd
 
 from functions import (
+    DATA_ROOT,
     # functions to load data
     load_parcels,
     load_zoning,
@@ -27,7 +34,12 @@ from functions import (
     attach_tract_data_to_parcels,
     # functions for saving
     save_parquet,
+    is_fresh,
+    shapefile_parts,
+    OUTPUT_FORMAT,
+    CANONICAL_CRS,
     # functions for census calculations
+    census_cache_path,
     pull_acs_data,
     compute_acs_indicators,
     pull_tracts,
@@ -35,25 +47,71 @@ from functions import (
     subset_city_tracts,
     merge_tracts_with_acs, 
     # functions for zoning
-    abbreviate_zoning,
-    zoning_classification, 
-    classify_zoning
+    abbreviate_zoning_series,
+    classify_zoning_series
 )
 
 #
 # Settings
 # ----------------------------------------
 OUTPUT_DIR = "../output"
-DATA_DIR = "../data/"
+DATA_DIR = "../data"
+STATE = "CA"
+YEAR = 2022
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# raw inputs (under functions.DATA_ROOT, i.e. the SJ_DATA_ROOT env var)
+RAW = {
+    "parcels": f"{DATA_ROOT}/Parcels/Parcels.shp",
+    "zoning": f"{DATA_ROOT}/Zoning_Districts/Zoning_Districts.shp",
+    "affordable": f"{DATA_ROOT}/Affordable_Rental_Housing/Affordable_Rental_Housing.shp",
+    "equity": f"{DATA_ROOT}/Equity_Index_Census_Tracts/Equity_Index_Census_Tracts.shp",
+}
+
+# processed outputs
+OUTPUTS = {
+    "parcels_zoned": f"{DATA_DIR}/processed/parcels_with_zoning.parquet",
+    "zoning": f"{DATA_DIR}/processed/zoning.parquet",
+    "equity": f"{DATA_DIR}/processed/equity.parquet",
+    "affordable": f"{DATA_DIR}/processed/affordable.parquet",
+    "sj_acs": f"{DATA_DIR}/processed/san_jose_tracts_with_acs.geoparquet",
+    "parcels_tracts": f"{DATA_DIR}/processed/parcels_with_zoning_and_tract_data.parquet",
+}
+
+# files each output is built from (every file of each shapefile;
+# census inputs are the local pull cache)
+STAGE_INPUTS = {
+    "parcels_zoned": shapefile_parts(RAW["parcels"]) + shapefile_parts(RAW["zoning"]),
+    "zoning": shapefile_parts(RAW["zoning"]),
+    "equity": shapefile_parts(RAW["equity"]),
+    "affordable": shapefile_parts(RAW["affordable"]),
+    "sj_acs": [census_cache_path("acs", STATE, YEAR)] + [
+        census_cache_path(name, STATE, YEAR, crs=CANONICAL_CRS) for name in ("tracts", "places")
+    ],
+    "parcels_tracts": [OUTPUTS["parcels_zoned"], OUTPUTS["sj_acs"]],
+}
+
 
 #
 # Define pipeline function
 # ----------------------------------------
-def run_etl():
+def run_etl(force=False):
     print("Starting ETL pipeline...\n")
 
+    # only rebuild outputs that are older than their inputs, missing, or
+    # written by an older version of the pipeline (OUTPUT_FORMAT)
+    stale = {
+        name: force or not is_fresh(OUTPUTS[name], *inputs, fmt=OUTPUT_FORMAT)
+        for name, inputs in STAGE_INPUTS.items()
+    }
+    # rebuilt upstream outputs always invalidate the parcel-tract join
+    stale["parcels_tracts"] |= stale["parcels_zoned"] or stale["sj_acs"]
+
+    if not any(stale.values()):
+        print("All outputs are up to date.")
+        return
+    print("Rebuilding: " + ", ".join(name for name, s in stale.items() if s) + "\n")
+
     # ======================
     #       EXTRACT
     # ======================
@@ -62,25 +120,72 @@ def run_etl():
     # Apply classification dictionary
     # ----------------------------------------
     print("Extracting data...")
-    
+
+    extract = {}
     # extract San Jose spatial data
-    parcels = load_parcels()
-    zoning = load_zoning()
-    #railroad = load_railroad()
-    #bikeways = load_bikeways()
-    #bikeracks = load_bike_racks()
-    affordable = load_affordable_housing()
-    equity = load_equity_index()
+    if stale["parcels_zoned"]:
+        extract["parcels"] = partial(load_parcels, RAW["parcels"])
+    if stale["parcels_zoned"] or stale["zoning"]:
+        extract["zoning"] = partial(load_zoning, RAW["zoning"])
+    #extract["railroad"] = load_railroad
+    #extract["bikeways"] = load_bikeways
+    #extract["bikeracks"] = load_bike_racks
+    if stale["affordable"]:
+        extract["affordable"] = partial(load_affordable_housing, RAW["affordable"])
+    if stale["equity"]:
+        extract["equity"] = partial(load_equity_index, RAW["equity"])
 
     # extract census data
-    acs_raw = pull_acs_data(state="CA", year=2022)
-    tracts = pull_tracts(state="CA", year=2022)
-    places = pull_places(state="CA", year=2022)
+    if stale["sj_acs"]:
+        extract["acs_raw"] = partial(pull_acs_data, state=STATE, year=YEAR)
+        extract["tracts"] = partial(pull_tracts, state=STATE, year=YEAR)
+        extract["places"] = partial(pull_places, state=STATE, year=YEAR)
+
+    # reuse up-to-date stage outputs instead of recomputing them
+    if stale["parcels_tracts"] and not stale["parcels_zoned"]:
+        extract["parcels_zoned"] = partial(gpd.read_parquet, OUTPUTS["parcels_zoned"])
+    if stale["parcels_tracts"] and not stale["sj_acs"]:
+        extract["sj_acs"] = partial(gpd.read_parquet, OUTPUTS["sj_acs"])
+
+    # loaders are independent and I/O bound (disk + Census API), so run
+    # them concurrently and wait on all of them before transforming
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        futures = {name: ex.submit(load) for name, load in extract.items()}
+    data = {name: f.result() for name, f in futures.items()}
 
     # ======================
     #      TRANSFORM
     # ======================
-    
+    if stale["parcels_zoned"]:
+        data["parcels_zoned"] = process_parcels(data["parcels"], data["zoning"])
+    if stale["sj_acs"]:
+        data["sj_acs"] = process_census(data["acs_raw"], data["tracts"], data["places"])
+    if stale["parcels_tracts"]:
+        data["parcels_tracts"] = process_parcel_tracts(data["parcels_zoned"], data["sj_acs"])
+
+    # ======================
+    #        LOAD
+    # ======================
+    print("Saving necessary outputs...")
+    outputs = [(data[name], OUTPUTS[name]) for name, s in stale.items() if s and name != "parcels_tracts"]
+
+    # each output goes to its own file, so write them in parallel
+    if outputs:
+        with ThreadPoolExecutor(max_workers=len(outputs)) as ex:
+            futures = [ex.submit(save_parquet, gdf, path=path) for gdf, path in outputs]
+        for f in futures:
+            f.result()  # surface any write errors
+
+    # the parcel-tract join is written last, so it ends up newer than the
+    # two outputs it is built from and the next run sees it as fresh
+    if stale["parcels_tracts"]:
+        save_parquet(data["parcels_tracts"], path=OUTPUTS["parcels_tracts"])
+
+
+#
+# Define pipeline stages
+# ----------------------------------------
+def process_parcels(parcels, zoning):
     #
     # Process parcel data
     # ----------------------------------------
@@ -92,30 +197,40 @@ def run_etl():
     # Process zoning data
     # ----------------------------------------
     print("Processing zoning data...")
-    # rewrite zoning abbreviations to be clearer for analysis
-    parcels_zoned["zoning"] = parcels_zoned["ZONING"].apply(abbreviate_zoning)
-    # create a new zoning classification variable in parcels data
-    parcels_zoned["zoning_class"] = parcels_zoned["ZONING"].apply(classify_zoning)
+    # create clearer zoning abbreviations and zoning classifications
+    # (vectorized lookups; missing codes -> "Unknown")
+    parcels_zoned["zoning"] = abbreviate_zoning_series(parcels_zoned["ZONING"])
+    parcels_zoned["zoning_class"] = classify_zoning_series(parcels_zoned["ZONING"])
     # create indicator of planned zoning
-    parcels_zoned["zoning_planned"] = parcels_zoned["ZONING"].str.upper().str.contains(r"\(PD\)", na=False)
-    
+    parcels_zoned["zoning_planned"] = (
+        parcels_zoned["ZONING"]
+        .str.contains("(PD)", regex=False, case=False, na=False)
+        .astype(bool)
+    )
+    # few distinct codes across many parcels, so store zoning columns as categories
+    for col in ("ZONING", "zoning", "zoning_class"):
+        parcels_zoned[col] = parcels_zoned[col].astype("category")
 
+    return parcels_zoned
+
+
+def process_census(acs_raw, tracts, places):
     #
     # Process Census data
     # ----------------------------------------
-    # 1. Create percent variables 
-    print("1. Processing Census data...")
-    acs = compute_acs_indicators(acs_raw)
-
-    # 2. Subset tracts to just San Jose
-    print("2. Subsetting tracts to San Jose...")
+    # 1. Subset tracts to just San Jose
+    print("1. Subsetting tracts to San Jose...")
     san_jose_tracts = subset_city_tracts(tracts, places, city_name="San Jose")
 
-    # 3. Merge tracts to just San Jose
-    print("3. Merging ACS with tract geometries...")
-    sj_acs = merge_tracts_with_acs(san_jose_tracts, acs)
+    # 2. Merge raw ACS onto San Jose tracts, then create percent variables
+    #    (indicators are only computed for San Jose, not every CA tract)
+    print("2. Merging ACS with tract geometries and processing Census data...")
+    sj_acs = merge_tracts_with_acs(san_jose_tracts, acs_raw).pipe(compute_acs_indicators)
+
+    return sj_acs
 
 
+def process_parcel_tracts(parcels_zoned, sj_acs):
     #
     # Attach tract-level ACS data to parcels
     # ----------------------------------------
@@ -130,18 +245,8 @@ def run_etl():
         "pct_college_plus"
     ]
     parcels_with_tract_data = attach_tract_data_to_parcels(parcels_zoned, sj_acs, tract_fields=tract_fields)
-    
-    
-    # ======================
-    #        LOAD
-    # ======================
-    print("Saving necessary outputs...")
-    save_parquet(parcels_zoned, path=f"{DATA_DIR}/processed/parcels_with_zoning.parquet")    
-    save_parquet(zoning, path=f"{DATA_DIR}/processed/zoning.parquet")
-    save_parquet(equity, path=f"{DATA_DIR}/processed/equity.parquet")
-    save_parquet(affordable, path=f"{DATA_DIR}/processed/affordable.parquet")
-    save_parquet(sj_acs, path=f"{DATA_DIR}/processed/san_jose_tracts_with_acs.geoparquet")
-    save_parquet(parcels_with_tract_data, path=f"{DATA_DIR}/processed/parcels_with_zoning_and_tract_data.parquet")
+
+    return parcels_with_tract_data
 
 
 # run pipeline
@@ -10,11 +10,19 @@ Jupyter notebook calls these functions in order.
 Author: Kasey Zapatka
 """
 
+from functools import lru_cache
 from pathlib import Path
+import json
+import numpy as np
 import geopandas as gpd
 import pandas as pd
-from shapely.geometry import Point
+import pyarrow.parquet as pq
+import shapely
+from pyproj import Transformer
+from shapely.geometry import Point, box
 import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
 from matplotlib.patches import Patch
 import folium
 from folium.features import GeoJsonTooltip
@@ -26,17 +34,81 @@ from folium.features import GeoJsonTooltip
 DIRIDON_LON_LAT = (-121.9036, 37.3292)
 MILE_IN_METERS = 1609.344
 
+# Lon/lat -> web mercator, for reprojecting single points
+_TO_3857 = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
+DIRIDON_POINT_3857 = Point(*_TO_3857.transform(*DIRIDON_LON_LAT))
+
+# Columns read from the processed parquet files (see load_data)
+PARCEL_COLUMNS = ["PARCELID", "ZONING", "zoning", "zoning_class", "geometry"]
+TRACT_FIELDS = [
+    "vacancy_rate",
+    "median_rent",
+    "pct_white",
+    "pct_black",
+    "pct_asian",
+    "pct_latino",
+    "pct_college_plus"
+]
+PARCEL_TRACT_COLUMNS = PARCEL_COLUMNS + ["GEOID"] + TRACT_FIELDS
+
 
 # ---------------------------------------------
 # Step 1: Load Data
 # ---------------------------------------------
 
+def _diridon_bbox(path, miles):
+    """
+    Bounds of the Diridon buffer of the given radius, expressed in the
+    CRS stored in the GeoParquet metadata of `path`, and whether the file
+    has a bbox covering column the reader can filter on.
+    """
+    geo = json.loads(pq.read_schema(path).metadata[b"geo"])
+    column = geo["columns"][geo["primary_column"]]
+    crs = column.get("crs", "OGC:CRS84")
+    pt_m, _, _ = build_diridon_buffers()
+    buffer_m = gpd.GeoSeries([pt_m.buffer(miles * MILE_IN_METERS)], crs="EPSG:3857")
+    return tuple(buffer_m.to_crs(crs).total_bounds), "covering" in column
+
+
 def load_data(parcels_path="../data/processed/parcels_with_zoning.parquet", 
               tracts_path="../data/processed/san_jose_tracts_with_acs.geoparquet",
-              parcels_tracts_path="../data/processed/parcels_with_zoning_and_tract_data.parquet"):
-    parcels = gpd.read_parquet(parcels_path)
-    tracts = gpd.read_parquet(tracts_path)
-    parcels_tracts = gpd.read_parquet(parcels_tracts_path)
+              parcels_tracts_path="../data/processed/parcels_with_zoning_and_tract_data.parquet",
+              bbox_miles=2,
+              parcel_columns=PARCEL_COLUMNS,
+              tract_columns=None,
+              parcel_tract_columns=PARCEL_TRACT_COLUMNS,
+              zoning_classes=None):
+    """
+    Load processed parcels and tracts.
+
+    Only rows whose bounding box overlaps the `bbox_miles` buffer around
+    Diridon Station are read, using the bbox covering column written by
+    the ETL pipeline. Files without that column (written by older
+    pipeline versions) are read whole and filtered the same way after
+    reading. Pass `bbox_miles=None` to read everything.
+
+    Only the listed columns are read from each file (None reads all),
+    so unused attributes are never decoded.
+
+    If `zoning_classes` is given, only parcels in those zoning classes
+    are read (pushed down to the parquet reader as a filter).
+    """
+    def read(path, columns, filters=None):
+        if bbox_miles is None:
+            return gpd.read_parquet(path, columns=columns, filters=filters)
+        bbox, has_covering = _diridon_bbox(path, bbox_miles)
+        if has_covering:
+            return gpd.read_parquet(path, columns=columns, bbox=bbox, filters=filters)
+        gdf = gpd.read_parquet(path, columns=columns, filters=filters)
+        return gdf.iloc[np.sort(gdf.sindex.query(box(*bbox)))]
+
+    parcel_filters = None
+    if zoning_classes is not None:
+        parcel_filters = [("zoning_class", "in", list(zoning_classes))]
+
+    parcels = read(parcels_path, parcel_columns, parcel_filters)
+    tracts = read(tracts_path, tract_columns)
+    parcels_tracts = read(parcels_tracts_path, parcel_tract_columns, parcel_filters)
     return parcels, tracts , parcels_tracts
 
 
@@ -61,13 +133,22 @@ def build_diridon_buffers():
     Create 1-mile and 2-mile buffers around Diridon Station.
     Returns buffers in EPSG:3857 (meters) for analysis.
     """
-    pt = gpd.GeoSeries([Point(*DIRIDON_LON_LAT)], crs="EPSG:4326")
-    pt_m = pt.to_crs("EPSG:3857").iloc[0]
+    pt_m = DIRIDON_POINT_3857
     buffer_1m = pt_m.buffer(1 * MILE_IN_METERS)
     buffer_2m = pt_m.buffer(2 * MILE_IN_METERS)
     return pt_m, buffer_1m, buffer_2m
 
 
+@lru_cache(maxsize=4)
+def _diridon_frames_4326(pt_m, buffer_1m, buffer_2m):
+    """
+    Wrap the station point and buffers (EPSG:3857) as EPSG:4326
+    GeoDataFrames for plotting. Cached, so treat the results as read-only.
+    """
+    frames = gpd.GeoDataFrame(geometry=[pt_m, buffer_1m, buffer_2m], crs="EPSG:3857").to_crs(4326)
+    return frames.iloc[[0]], frames.iloc[[1]], frames.iloc[[2]]
+
+
 # ---------------------------------------------
 # Step 4: Parcel Summary
 # ---------------------------------------------
@@ -81,12 +162,16 @@ def summarize_parcels(parcels_m, buffer_1m):
     parcels_m : GeoDataFrame in EPSG:3857
     buffer_1m : Polygon geometry in EPSG:3857
     """
-    parcels_m = parcels_m.copy()
-    parcels_m["centroid"] = parcels_m.geometry.centroid
-    centroids = parcels_m.set_geometry("centroid")
+    # centroids stay plain x/y arrays; no centroid column or frame copy
+    centroids = shapely.centroid(parcels_m.geometry.to_numpy())
+    cx, cy = shapely.get_x(centroids), shapely.get_y(centroids)
+
+    # point-in-polygon for all centroids in one C loop over the
+    # coordinate arrays, against the buffer polygon as given
+    shapely.prepare(buffer_1m)
+    mask = shapely.contains_xy(buffer_1m, cx, cy)
 
-    within_1m = centroids[centroids.centroid.within(buffer_1m)].copy()
-    within_1m = within_1m.set_geometry("geometry")  # Reset to original geometry
+    within_1m = parcels_m[mask]
     
     uv = within_1m[within_1m["zoning_class"] == "Urban Village"]
 
@@ -112,14 +197,14 @@ def summarize_acs(tracts_m, buffer_2m, acs_cols):
     buffer_2m : Polygon geometry in EPSG:3857
     acs_cols : dict mapping labels to column names
     """
-    tracts_m = tracts_m.copy()
-    tracts_m["in_buffer"] = tracts_m.geometry.intersects(buffer_2m)
-    tracts_sel = tracts_m[tracts_m["in_buffer"]].copy()
+    # spatial index (STRtree) prefilters tracts by envelope before the
+    # exact intersects test
+    idx = tracts_m.sindex.query(buffer_2m, predicate="intersects")
+    tracts_sel = tracts_m.iloc[np.sort(idx)]
 
-    summary = {}
-    for label, col in acs_cols.items():
-        if col in tracts_sel.columns:
-            summary[label] = tracts_sel[col].mean()
+    present = [col for col in acs_cols.values() if col in tracts_sel.columns]
+    means = tracts_sel[present].mean(numeric_only=True)
+    summary = {label: means[col] for label, col in acs_cols.items() if col in means.index}
 
     return tracts_sel, summary
 
@@ -128,7 +213,7 @@ def summarize_acs(tracts_m, buffer_2m, acs_cols):
 # Step 6: Maps (EPSG:4326 + EPSG:3857 for buffers)
 # ---------------------------------------------
 
-def create_maps(parcels, tracts, output_dir):
+def create_maps(parcels, tracts, output_dir, pt_m=None, buffer_1m=None, buffer_2m=None):
     """
     Create static map of parcels and zoning near Diridon Station
     with accurate 1-mile and 2-mile buffers.
@@ -141,6 +226,8 @@ def create_maps(parcels, tracts, output_dir):
     parcels : GeoDataFrame
     tracts : GeoDataFrame
     output_dir : str or Path
+    pt_m, buffer_1m, buffer_2m : geometries in EPSG:3857, optional
+        Output of build_diridon_buffers(); built here if not given.
 
     Returns:
     --------
@@ -150,46 +237,36 @@ def create_maps(parcels, tracts, output_dir):
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # ---------------------------------------------------------
-    # 1. Reproject parcels + tracts to EPSG:4326 for consistent plotting
+    # 1. Parcels go to EPSG:3857 to match the metric buffers. A frame
+    #    already in 3857 (e.g. from reproject_for_buffering) is used as-is,
+    #    so its cached spatial index is reused rather than rebuilt.
     # ---------------------------------------------------------
-    parcels_4326 = parcels.to_crs(4326)
-    tracts_4326 = tracts.to_crs(4326)
+    parcels_3857 = parcels if parcels.crs == "EPSG:3857" else parcels.to_crs(3857)
 
     # ---------------------------------------------------------
-    # 2. Create Diridon Station point (4326 -> 3857)
+    # 2-3. Diridon Station point + 1-mile and 2-mile buffers
+    #      (built in EPSG:3857 by build_diridon_buffers, shown in 4326)
     # ---------------------------------------------------------
-    diridon_station_4326 = gpd.GeoDataFrame(
-        geometry=[Point(*DIRIDON_LON_LAT)],
-        crs="EPSG:4326"
-    )
+    if pt_m is None or buffer_1m is None or buffer_2m is None:
+        pt_m, buffer_1m, buffer_2m = build_diridon_buffers()
 
-    # Convert to EPSG:3857 for accurate buffer geometry
-    diridon_station_3857 = diridon_station_4326.to_crs(3857)
-
-    # ---------------------------------------------------------
-    # 3. Create 1-mile and 2-mile buffers in meters (EPSG:3857)
-    # ---------------------------------------------------------
-    buffer_1mile_3857 = diridon_station_3857.buffer(MILE_IN_METERS)
-    buffer_2mile_3857 = diridon_station_3857.buffer(2 * MILE_IN_METERS)
-
-    # Convert buffers back to 4326 for overlay + plotting
-    buffer_1mile_4326 = gpd.GeoDataFrame(geometry=buffer_1mile_3857, crs=3857).to_crs(4326)
-    buffer_2mile_4326 = gpd.GeoDataFrame(geometry=buffer_2mile_3857, crs=3857).to_crs(4326)
+    diridon_station_4326, buffer_1mile_4326, buffer_2mile_4326 = (
+        _diridon_frames_4326(pt_m, buffer_1m, buffer_2m)
+    )
 
     # ---------------------------------------------------------
-    # 4. Subset parcels within buffers (now everything matches in 4326)
+    # 4. Subset parcels within buffers (in EPSG:3857, where buffers are native)
+    #    Parcels are selected, not clipped, so original geometries are kept.
+    #    The spatial index prefilters by envelope before the exact test,
+    #    and the same index serves both buffers. Only the 2-mile subset
+    #    is reprojected to 4326; the 1-mile set is nested inside it.
     # ---------------------------------------------------------
-    parcels_within_2mile = gpd.overlay(
-        parcels_4326,
-        buffer_2mile_4326,
-        how="intersection"
-    )
+    sindex = parcels_3857.sindex
+    idx_2mile = np.sort(sindex.query(buffer_2m, predicate="intersects"))
+    idx_1mile = sindex.query(buffer_1m, predicate="intersects")
 
-    parcels_within_1mile = gpd.overlay(
-        parcels_4326,
-        buffer_1mile_4326,
-        how="intersection"
-    )
+    parcels_within_2mile = parcels_3857.iloc[idx_2mile].to_crs(4326)
+    parcels_within_1mile = parcels_within_2mile[np.isin(idx_2mile, idx_1mile)]
 
     # ---------------------------------------------------------
     # 5. Identify urban-zoned parcels + define colors
@@ -214,13 +291,31 @@ def create_maps(parcels, tracts, output_dir):
         "Municipal/Neighborhood Mixed Use": "#a65628"
     }
 
+    # Count urban parcels by zoning once; reused for plotting,
+    # the footnote and the printed breakdown
+    counts = uz_within_1mile["zoning"].value_counts()
+    zoning_counts = {z: int(counts[z]) for z in urban_zoning if counts.get(z, 0) > 0}
+
     # ---------------------------------------------------------
     # 6. Build the figure
     # ---------------------------------------------------------
-    fig, ax = plt.subplots(figsize=(14, 12))
+    # Figure is built without pyplot so no GUI backend or global
+    # figure state is involved; it renders straight to the file
+    fig = Figure(figsize=(14, 12))
+    ax = fig.subplots()
+
+    # Map extent: 2-mile buffer plus a small lat/lon padding
+    xmin, ymin, xmax, ymax = buffer_2mile_4326.total_bounds
+    pad = 0.01
+    extent = box(xmin - pad, ymin - pad, xmax + pad, ymax + pad)
 
-    # Tracts background
-    tracts_4326.plot(ax=ax, color="lightgrey", edgecolor="grey", alpha=0.3)
+    # Tracts background (only those inside the visible extent), selected
+    # with the tracts' own spatial index and then reprojected for plotting
+    extent_native = gpd.GeoSeries([extent], crs=4326).to_crs(tracts.crs).iloc[0]
+    visible_tracts = tracts.iloc[
+        np.sort(tracts.sindex.query(extent_native, predicate="intersects"))
+    ].to_crs(4326)
+    visible_tracts.plot(ax=ax, color="lightgrey", edgecolor="grey", alpha=0.3)
 
     # 2-mile buffer
     buffer_2mile_4326.boundary.plot(
@@ -232,18 +327,22 @@ def create_maps(parcels, tracts, output_dir):
         ax=ax, color="lightgrey", edgecolor="white", linewidth=0.1
     )
 
-    # Urban zoning colors
-    for zone_type in urban_zoning:
-        zp = uz_within_1mile[uz_within_1mile["zoning"] == zone_type]
-        if len(zp) > 0:
-            zp.plot(
-                ax=ax,
-                color=zoning_colors[zone_type],
-                alpha=0.7,
-                edgecolor="black",
-                linewidth=0.2,
-                label=f"{zone_type} ({len(zp)} parcels)"
-            )
+    # Urban zoning colors, drawn as one collection; the categories fix
+    # which color each zoning type gets
+    if zoning_counts:
+        present = list(zoning_counts)
+        uz_within_1mile.assign(
+            zoning=pd.Categorical(uz_within_1mile["zoning"], categories=present)
+        ).plot(
+            ax=ax,
+            column="zoning",
+            categorical=True,
+            cmap=ListedColormap([zoning_colors[z] for z in present]),
+            alpha=0.7,
+            edgecolor="black",
+            linewidth=0.2,
+            legend=False
+        )
 
     # 1-mile buffer
     buffer_1mile_4326.boundary.plot(
@@ -263,8 +362,6 @@ def create_maps(parcels, tracts, output_dir):
     # ---------------------------------------------------------
     # Set extent to 2-mile buffer
     # ---------------------------------------------------------
-    xmin, ymin, xmax, ymax = buffer_2mile_4326.total_bounds
-    pad = 0.01  # small lat/lon padding
     ax.set_xlim(xmin - pad, xmax + pad)
     ax.set_ylim(ymin - pad, ymax + pad)
 
@@ -279,7 +376,7 @@ def create_maps(parcels, tracts, output_dir):
     # Custom legend
     legend_handles = [
         Patch(facecolor=zoning_colors[z], edgecolor="black", label=z)
-        for z in uz_within_1mile["zoning"].unique()
+        for z in zoning_counts
     ]
     legend_handles.extend([
         Patch(facecolor="none", edgecolor="black", linestyle="--", label="1-mile radius"),
@@ -300,38 +397,38 @@ def create_maps(parcels, tracts, output_dir):
     footnote_lines = [
         "Share of urban-zoned parcels within 1 mile of San Jose Diridon Station:"
     ]
-    for z in urban_zoning:
-        count = len(uz_within_1mile[uz_within_1mile["zoning"] == z])
-        if count > 0:
-            pct = (count / total) * 100
-            footnote_lines.append(f"  {z}: {pct:.1f}% ({count:,} parcels)")
+    breakdown_lines = []  # printed once the map is saved
+    for z, count in zoning_counts.items():
+        pct = (count / total) * 100
+        footnote_lines.append(f"  {z}: {pct:.1f}% ({count:,} parcels)")
+        breakdown_lines.append(f"  - {z}: {count} parcels")
     footnote_lines.append(f"Total parcels: {total:,}")
 
     fig.text(0.12, 0.02, "\n".join(footnote_lines), fontsize=8, ha="left")
 
+    # Fixed margins instead of a tight-bbox pass: the map fills the page
+    # down to the footnote (8pt lines at matplotlib's 1.2 line spacing)
+    footnote_height = len(footnote_lines) * 8 * 1.2 / 72 / fig.get_figheight()
+    fig.subplots_adjust(left=0.02, right=0.98, top=0.94, bottom=0.04 + footnote_height)
+
     # ---------------------------------------------------------
     # Save
     # ---------------------------------------------------------
     outpath =  Path(output_dir) / "diridon_buffer_map.pdf"
-    plt.savefig(outpath, dpi=150, bbox_inches="tight")
-    plt.close()
+    # Vector PDF: dpi only affects rasterized artists, and the fixed
+    # margins above replace the tight-bbox pass (a second full render)
+    fig.savefig(outpath, dpi=100)
 
     print(f"✓ Map saved to: {outpath}")
     print("✓ Zoning breakdown:")
-    for z in urban_zoning:
-        c = len(uz_within_1mile[uz_within_1mile["zoning"] == z])
-        if c > 0:
-            print(f"  - {z}: {c} parcels")
+    for line in breakdown_lines:
+        print(line)
 
     return outpath
 
 # ---------------------------------------------
 # Step 7: Interactive Map
 # ---------------------------------------------
-import folium
-from folium.features import GeoJsonTooltip
-from pathlib import Path
-import json
 
 def create_interactive_map(parcels_with_tract_data, tracts, output_dir):
     """
@@ -354,7 +451,7 @@ def create_interactive_map(parcels_with_tract_data, tracts, output_dir):
     """
 
     # Reproject to EPSG:4326 (required by Folium)
-    parcels_proj = parcels_with_tract_data.to_crs(epsg=4326)
+    # (parcels are reprojected below, after filtering and column selection)
     tracts_proj = tracts.to_crs(epsg=4326)
 
     # Diridon Station coordinates
@@ -370,15 +467,22 @@ def create_interactive_map(parcels_with_tract_data, tracts, output_dir):
     # ------------------------
     # Add tracts as background
     # ------------------------
-    tracts_clean = tracts_proj[["geometry"]].copy()  # only geometry column
+    # only geometry column, and only tracts within the 2-mile buffer
+    _, _, buffer_2mile_4326 = _diridon_frames_4326(*build_diridon_buffers())
+    tracts_clean = tracts_proj.iloc[
+        np.sort(tracts_proj.sindex.query(buffer_2mile_4326.geometry.iloc[0], predicate="intersects"))
+    ][["geometry"]]
+    # folium calls style_function once per feature, so each layer's
+    # function just hands back a style dict built ahead of time
+    tract_style = {
+        "fillColor": "lightblue",
+        "color": "grey",
+        "weight": 0.5,
+        "fillOpacity": 0.2,
+    }
     folium.GeoJson(
-        json.loads(tracts_clean.to_json()),
-        style_function=lambda x: {
-            "fillColor": "lightblue",
-            "color": "grey",
-            "weight": 0.5,
-            "fillOpacity": 0.2,
-        },
+        tracts_clean.to_geo_dict(show_bbox=False),
+        style_function=lambda x: tract_style,
         name="Census Tracts"
     ).add_to(m)
 
@@ -417,41 +521,33 @@ def create_interactive_map(parcels_with_tract_data, tracts, output_dir):
     }
 
     urban_zoning = list(zoning_colors.keys())
-    parcels_uv = parcels_proj[parcels_proj["zoning"].isin(urban_zoning)].copy()
 
     # Fields from tract-level data to show in popup
-    tract_fields = [
-        "vacancy_rate",
-        "median_rent",
-        "pct_white",
-        "pct_black",
-        "pct_asian",
-        "pct_latino",
-        "pct_college_plus"
-    ]
+    tract_fields = [f for f in TRACT_FIELDS if f in parcels_with_tract_data.columns]
+
+    # Tooltip fields: zoning + ACS tract fields + parcel + tract ID
+    tooltip_fields = ["PARCELID", "GEOID", "zoning"] + tract_fields
+    aliases = ["Parcel ID:", "Tract GEOID:", "Zoning type:"] + [f.replace("_", " ").title() for f in tract_fields]
+
+    # Keep only urban parcels and serializable tooltip columns, then reproject
+    parcels_uv = parcels_with_tract_data.loc[
+        parcels_with_tract_data["zoning"].isin(urban_zoning),
+        ["geometry"] + tooltip_fields
+    ].to_crs(epsg=4326)
 
     # Add parcels by zoning type
     for zone_type, color in zoning_colors.items():
-        subset = parcels_uv[parcels_uv["zoning"] == zone_type]
-        if not subset.empty:
-            # Keep only serializable columns
-            subset_clean = subset[
-                ["geometry", "PARCELID", "GEOID", "zoning"] + 
-                [f for f in tract_fields if f in subset.columns]
-            ].copy()
-            
-            # Tooltip fields: zoning + ACS tract fields + parcel + tract ID
-            tooltip_fields = ["PARCELID", "GEOID", "zoning"] + [f for f in tract_fields if f in subset_clean.columns]
-            aliases = ["Parcel ID:", "Tract GEOID:", "Zoning type:"] + [f.replace("_", " ").title() for f in tract_fields]
-
+        subset_clean = parcels_uv[parcels_uv["zoning"] == zone_type]
+        if not subset_clean.empty:
+            zone_style = {
+                "fillColor": color,
+                "color": "black",
+                "weight": 0.3,
+                "fillOpacity": 0.7
+            }
             folium.GeoJson(
-                json.loads(subset_clean.to_json()),
-                style_function=lambda x, c=color: {
-                    "fillColor": c,
-                    "color": "black",
-                    "weight": 0.3,
-                    "fillOpacity": 0.7
-                },
+                subset_clean.to_geo_dict(show_bbox=False),
+                style_function=lambda x, s=zone_style: s,
                 tooltip=GeoJsonTooltip(
                     fields=tooltip_fields,
                     aliases=aliases,
@@ -491,25 +587,24 @@ def export_outputs(within_1m, uv, tracts_sel, acs_summary, output_dir):
     """
     Export analysis results to files.
     
-    Note: Data will be saved in EPSG:3857. Convert back to EPSG:4326 
-    before final export if needed for compatibility.
+    Note: Data is saved in the CRS it is passed in (EPSG:3857 in the
+    notebook); the CRS is recorded in the GeoParquet metadata, so
+    readers can reproject with .to_crs(4326) if they need lon/lat.
     """
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Convert back to EPSG:4326 for storage/sharing
-    within_1m_geo = within_1m.to_crs("EPSG:4326")
-    uv_geo = uv.to_crs("EPSG:4326")
-    tracts_sel_geo = tracts_sel.to_crs("EPSG:4326")
+    # zstd for smaller shareable files; bbox covering column for readers
+    parquet_opts = dict(compression="zstd", compression_level=3, write_covering_bbox=True)
 
     p1 = output_dir / "diridon_parcels_1mile.parquet"
-    within_1m_geo.to_parquet(p1)
+    within_1m.to_parquet(p1, **parquet_opts)
 
     p2 = output_dir / "diridon_uv_parcels_1mile.parquet"
-    uv_geo.to_parquet(p2)
+    uv.to_parquet(p2, **parquet_opts)
 
     p3 = output_dir / "diridon_tracts_2mile.parquet"
-    tracts_sel_geo.to_parquet(p3)
+    tracts_sel.to_parquet(p3, **parquet_opts)
 
     acs_df = pd.DataFrame([acs_summary])
     acs_out = output_dir / "diridon_acs_2mile_summary.csv"
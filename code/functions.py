@@ -12,11 +12,17 @@
 
 # for data management
 import os
+import json
+from concurrent.futures import ThreadPoolExecutor
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
+import pyproj
+import shapely
 # for data visualization 
 import seaborn as sns
-from shapely.geometry import Point
+from shapely.geometry import Point, box
 import matplotlib.pyplot as plt
 import mapclassify
 # for census analysis 
@@ -28,11 +34,74 @@ from pygris.data import get_census
 # EXTRACT FUNCTIONS
 # ==========================================================================
 
-def load_parcels(path="../data/raw/Parcels/Parcels.shp"):
-    return gpd.read_file(path)
-
-def load_zoning(path="../data/raw/Zoning_Districts/Zoning_Districts.shp"):
-    return gpd.read_file(path)
+# root of the raw data layout (override with the SJ_DATA_ROOT env var)
+DATA_ROOT = os.environ.get("SJ_DATA_ROOT", "../data/raw")
+
+# every dataset is projected once, when it is read, into one equal-area CRS
+# (NAD83 / California Albers, meters); maps reproject only for display
+CANONICAL_CRS = "EPSG:3310"
+
+# cache a shapefile as GeoParquet in CANONICAL_CRS (Hilbert-sorted, bbox
+# covering column) so later reads skip the shapefile parse and reprojection
+# and can prune row groups by bbox
+def materialize_geoparquet(path_shp, path_parquet=None):
+    if path_parquet is None:
+        path_parquet = geoparquet_cache_path(path_shp)
+    gdf = gpd.read_file(path_shp, engine="pyogrio", use_arrow=True)
+    save_parquet(gdf.to_crs(CANONICAL_CRS), path_parquet)
+    return path_parquet
+
+# cache names carry the CRS, so changing CANONICAL_CRS rebuilds them
+def crs_tag(crs=CANONICAL_CRS):
+    return crs.replace(":", "").lower()
+
+def geoparquet_cache_path(path_shp):
+    return f"{os.path.splitext(path_shp)[0]}.{crs_tag()}.parquet"
+
+# every file of a shapefile that affects what is read (geometry, index,
+# attributes, projection, encoding), for freshness checks; the optional
+# .prj/.cpg are listed only when present
+def shapefile_parts(path_shp):
+    stem = os.path.splitext(path_shp)[0]
+    optional = [stem + ext for ext in (".prj", ".cpg") if os.path.exists(stem + ext)]
+    return [path_shp, stem + ".shx", stem + ".dbf"] + optional
+
+# San José city extent with a small margin; a GeoSeries, so it is
+# reprojected into the dataset's CRS before filtering (the loaders' default)
+SJ_BBOX = gpd.GeoSeries([box(-122.08, 37.10, -121.56, 37.48)], crs="EPSG:4326")
+
+# read through pyogrio with arrow transfer to avoid per-feature Python objects;
+# shapefiles are read from their GeoParquet copy, refreshed when any of the
+# shapefile's files changes,
+# and everything is returned in CANONICAL_CRS
+# (bbox is (xmin, ymin, xmax, ymax) in CANONICAL_CRS whatever the source, or
+# a GeoSeries such as SJ_BBOX that carries its own CRS; columns limits the
+# attribute columns read, geometry is always kept)
+def read_spatial(path, bbox=None, columns=None, **kwargs):
+    if bbox is not None and not isinstance(bbox, (gpd.GeoSeries, gpd.GeoDataFrame)):
+        bbox = gpd.GeoSeries([box(*bbox)], crs=CANONICAL_CRS)
+    if path.endswith(".shp"):
+        cached = geoparquet_cache_path(path)
+        if not is_fresh(cached, *shapefile_parts(path), fmt=OUTPUT_FORMAT):
+            materialize_geoparquet(path, cached)
+        if bbox is not None:
+            bbox = tuple(bbox.to_crs(CANONICAL_CRS).total_bounds)
+        if columns is not None:
+            columns = [c for c in columns if c != "geometry"] + ["geometry"]
+        return gpd.read_parquet(cached, bbox=bbox, columns=columns, **kwargs)
+    # read_file reprojects a GeoSeries bbox into the source CRS itself
+    gdf = gpd.read_file(path, engine="pyogrio", use_arrow=True, bbox=bbox, columns=columns, **kwargs)
+    return gdf.to_crs(CANONICAL_CRS)
+
+def load_parcels(path=f"{DATA_ROOT}/Parcels/Parcels.shp", bbox=SJ_BBOX, columns=None):
+    parcels = read_spatial(path, bbox=bbox, columns=columns)
+    # string parcel IDs become categorical codes (cheaper to hash in the dedup)
+    if "PARCELID" in parcels and not pd.api.types.is_numeric_dtype(parcels["PARCELID"]):
+        parcels["PARCELID"] = parcels["PARCELID"].astype("category")
+    return parcels
+
+def load_zoning(path=f"{DATA_ROOT}/Zoning_Districts/Zoning_Districts.shp", bbox=SJ_BBOX, columns=None):
+    return read_spatial(path, bbox=bbox, columns=columns)
 
 #def load_railroad(path="../data/Railroad/Railroad.shp"):
 #    rr = gpd.read_file(path)
@@ -44,17 +113,25 @@ def load_zoning(path="../data/raw/Zoning_Districts/Zoning_Districts.shp"):
 #def load_bike_racks(path="../data/Bike_Racks/Bike_Racks.shp"):
 #    return gpd.read_file(path)
 
-def load_affordable_housing(path="../data/raw/Affordable_Rental_Housing/Affordable_Rental_Housing.shp"):
-    return gpd.read_file(path)
+def load_affordable_housing(path=f"{DATA_ROOT}/Affordable_Rental_Housing/Affordable_Rental_Housing.shp", bbox=SJ_BBOX, columns=None):
+    return read_spatial(path, bbox=bbox, columns=columns)
 
-def load_equity_index(path="../data/raw/Equity_Index_Census_Tracts/Equity_Index_Census_Tracts.shp"):
-    return gpd.read_file(path)
+def load_equity_index(path=f"{DATA_ROOT}/Equity_Index_Census_Tracts/Equity_Index_Census_Tracts.shp", bbox=SJ_BBOX, columns=None):
+    return read_spatial(path, bbox=bbox, columns=columns)
 
 
 # ==========================================================================
 # TRANSFORM FUNCTIONS
 # ==========================================================================
 
+# CRS check that treats equivalent definitions (EPSG code vs WKT, axis order)
+# as equal, so only a real mismatch triggers a full reprojection
+def same_crs(a, b):
+    if a is None or b is None:
+        return a is b
+    return a.equals(b, ignore_axis_order=True)
+
+
 def join_parcels_zoning(parcels, zoning):
     """
     Perform spatial join assigning each parcel to the zoning district with the
@@ -69,12 +146,14 @@ def join_parcels_zoning(parcels, zoning):
     joined = sjoin_parcels_to_zd(parcels, zoning, how="largest")
 
     # Deduplicate — keep only the zoning record with the largest overlap_area
-    cleaned = (
-        joined
-        .sort_values(["PARCELID", "overlap_area"], ascending=[True, False])
-        .drop_duplicates(subset="PARCELID", keep="first")
-        .reset_index(drop=True)
-    )
+    # (a hash groupby + idxmax instead of sorting every parcel-zoning pair;
+    # missing PARCELIDs form one group, as drop_duplicates treated them)
+    joined = joined.reset_index(drop=True)
+    if joined["PARCELID"].is_unique:
+        return joined
+
+    idx = joined.groupby("PARCELID", sort=False, observed=True, dropna=False)["overlap_area"].idxmax()
+    cleaned = joined.loc[idx].reset_index(drop=True)
 
     return cleaned
 
@@ -83,7 +162,6 @@ def attach_tract_data_to_parcels(parcels_gdf, tracts_gdf, tract_fields=None):
     Spatially join parcels to census tracts, attaching selected tract-level fields
     to each parcel. Ensures GEOID is always included and correctly named.
     """
-    import geopandas as gpd
 
     if tract_fields is None:
         tract_fields = [
@@ -97,28 +175,28 @@ def attach_tract_data_to_parcels(parcels_gdf, tracts_gdf, tract_fields=None):
         ]
 
     # Ensure CRS match
-    if parcels_gdf.crs != tracts_gdf.crs:
+    if not same_crs(parcels_gdf.crs, tracts_gdf.crs):
         tracts_gdf = tracts_gdf.to_crs(parcels_gdf.crs)
 
     # Keep only requested columns + GEOID
     fields_to_keep = ["GEOID"] + [f for f in tract_fields if f in tracts_gdf.columns]
-    tracts_subset = tracts_gdf[["geometry"] + fields_to_keep].copy()
-
-    # Spatial join
-    parcels_with_tract_data = gpd.sjoin(
-        parcels_gdf.set_geometry("geometry"),
-        tracts_subset.set_geometry("geometry"),
-        how="left",
-        predicate="within"
-    )
-
-    # Drop extra geometry column and rename GEOID
-    parcels_with_tract_data = parcels_with_tract_data.drop(columns=["index_right"], errors="ignore")
-    
-    # If GEOID got a suffix, rename to plain 'GEOID'
-    for col in parcels_with_tract_data.columns:
-        if col.endswith("_right") and col.startswith("GEOID"):
-            parcels_with_tract_data = parcels_with_tract_data.rename(columns={col: "GEOID"})
+    tract_attrs = tracts_gdf[fields_to_keep].set_index("GEOID")
+
+    # Point-in-polygon on each parcel's representative point (always inside
+    # the parcel), pre-filtered by the tracts' STRtree; only GEOID is looked
+    # up here, so tract attributes aren't carried through the join
+    points = shapely.point_on_surface(parcels_gdf.geometry.to_numpy())
+    l, r = tracts_gdf.sindex.query(points, predicate="within")
+    pos = np.full(len(parcels_gdf), -1)
+    pos[l] = r
+    tract_keys = tracts_gdf["GEOID"].reset_index(drop=True).reindex(pos)
+
+    # Attach tract attributes by GEOID (an existing parcel GEOID keeps
+    # the _left suffix sjoin used to give it); GEOID is assigned by
+    # position, so a non-unique parcel index still keeps one row per parcel
+    parcels_with_tract_data = parcels_gdf.rename(columns={"GEOID": "GEOID_left"})
+    parcels_with_tract_data["GEOID"] = tract_keys.array
+    parcels_with_tract_data = parcels_with_tract_data.join(tract_attrs, on="GEOID")
 
     return parcels_with_tract_data
 
@@ -127,10 +205,54 @@ def attach_tract_data_to_parcels(parcels_gdf, tracts_gdf, tract_fields=None):
 # LOAD FUNCTIONS
 # ==========================================================================
 
+# order rows along a Hilbert curve so nearby features share row groups
+# (rows with missing/empty geometry go last)
+def spatial_sort(gdf):
+    has_geom = (gdf.geometry.notna() & ~gdf.geometry.is_empty).to_numpy()
+    pos = np.flatnonzero(has_geom)
+    if len(pos) == 0:
+        return gdf
+    dist = gdf.geometry.iloc[pos].hilbert_distance().to_numpy()
+    order = np.concatenate([pos[np.argsort(dist, kind="stable")], np.flatnonzero(~has_geom)])
+    return gdf.iloc[order]
+
 # save as parquet which is slightly more efficient 
-def save_parquet(gdf, path="../output/output.parquet"):
+# (a bbox covering column lets readers pass bbox= and skip row groups;
+# spatially sorted, smallish row groups make that skipping effective)
+# bump whenever the layout of written files changes (CRS, columns, dtypes,
+# bbox covering, ...) so files written by older code count as stale
+OUTPUT_FORMAT = "2"
+
+def save_parquet(gdf, path="../output/output.parquet", row_group_size=10_000):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    gdf.to_parquet(path, index=False, engine="pyarrow")
+    out = spatial_sort(gdf)
+    # stamped into the file metadata (pandas attrs), checked by is_fresh
+    out.attrs = {**gdf.attrs, "output_format": OUTPUT_FORMAT}
+    out.to_parquet(
+        path,
+        index=False,
+        engine="pyarrow",
+        geometry_encoding="WKB",
+        schema_version="1.1.0",
+        write_covering_bbox=True,
+        row_group_size=row_group_size
+    )
+
+
+# format stamp save_parquet wrote into a parquet file (None if unstamped)
+def output_format(path):
+    metadata = pq.read_schema(path).metadata or {}
+    return json.loads(metadata.get(b"PANDAS_ATTRS", b"{}")).get("output_format")
+
+# make-style freshness check: output exists and is newer than every input
+# (with fmt, the output must also carry that format stamp)
+def is_fresh(output, *inputs, fmt=None):
+    if not os.path.exists(output) or not all(os.path.exists(i) for i in inputs):
+        return False
+    if fmt is not None and output_format(output) != fmt:
+        return False
+    out_mtime = os.path.getmtime(output)
+    return all(out_mtime > os.path.getmtime(i) for i in inputs)
 
 
 # ==========================================================================
@@ -143,32 +265,92 @@ def save_parquet(gdf, path="../output/output.parquet"):
 # Join parcels to zoning data by selecting the zoning category with the 
 # largest overlap of area on a parcel.
 
-# import necessary libraries
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import geopandas as gpd
-from shapely.geometry import Point
+# overlap area of each parcel/zoning pair, given each pair's precomputed
+# parcel area; zoning_idx holds each pair's position in zoning_arr
+# (shapely releases the GIL, so pair chunks run in parallel threads)
+def _overlap_areas_chunk(parcel_geoms, zoning_arr, zoning_idx, parcel_areas, copy=True):
+    # GEOS builds a prepared geometry's index lazily and without locking,
+    # so with copy each chunk prepares its own copies of the districts it
+    # touches instead of sharing prepared polygons across threads
+    used, pos = np.unique(zoning_idx, return_inverse=True)
+    local = zoning_arr[used]
+    if copy:
+        local = shapely.from_wkb(shapely.to_wkb(local))
+    shapely.prepare(local)
+    zoning_geoms = local[pos]
+
+    # parcels fully inside a district overlap by their own (cached) area,
+    # so only the rest need the polygon clip
+    inside = shapely.contains_properly(zoning_geoms, parcel_geoms)
+    overlap = np.empty(len(parcel_geoms))
+    overlap[inside] = parcel_areas[inside]
+    overlap[~inside] = shapely.area(shapely.intersection(
+        parcel_geoms[~inside], zoning_geoms[~inside]
+    ))
+    return overlap
+
+def overlap_areas(parcel_geoms, zoning_arr, zoning_idx, parcel_areas=None, workers=None, min_chunk=5_000):
+    if parcel_areas is None:
+        parcel_areas = shapely.area(parcel_geoms)
+    workers = workers or os.cpu_count() or 1
+    n_chunks = max(1, min(workers, len(parcel_geoms) // min_chunk))
+    if n_chunks == 1:
+        # one thread: the districts can be prepared in place
+        return _overlap_areas_chunk(parcel_geoms, zoning_arr, zoning_idx, parcel_areas, copy=False)
+    chunks = np.array_split(np.arange(len(parcel_geoms)), n_chunks)
+    with ThreadPoolExecutor(max_workers=n_chunks) as pool:
+        parts = pool.map(
+            lambda idx: _overlap_areas_chunk(parcel_geoms[idx], zoning_arr, zoning_idx[idx], parcel_areas[idx]),
+            chunks
+        )
+        return np.concatenate(list(parts))
 
 
 # define spatial join function
-def sjoin_parcels_to_zd(parcels, zoning, how="largest"):
+def sjoin_parcels_to_zd(parcels, zoning, how="largest", workers=None):
     
     # ensure same CRS
-    if parcels.crs != zoning.crs:
+    if not same_crs(parcels.crs, zoning.crs):
         zoning = zoning.to_crs(parcels.crs)
     
-    # spatial join (parcels will appear multiple times if overlapping multiple zoning districts)
-    joined = gpd.sjoin(parcels, zoning, how="left", predicate="intersects")
-    
+    # bulk-query the zoning STRtree once for every intersecting parcel-zoning pair
+    # (parcels will appear multiple times if overlapping multiple zoning districts)
+    l, r = zoning.sindex.query(parcels.geometry.values, predicate="intersects")
+
+    # left join: parcels with no zoning match keep one row with r = -1
+    unmatched = np.setdiff1d(np.arange(len(parcels)), l)
+    l = np.concatenate([l, unmatched])
+    r = np.concatenate([r, np.full(len(unmatched), -1)])
+    order = np.argsort(l, kind="stable")
+    l, r = l[order], r[order]
+
+    # take + concat the matched rows (clashing column names get sjoin's suffixes)
+    zoning_attrs = zoning.drop(columns=zoning.geometry.name).reset_index(drop=True).reindex(r)
+    shared = parcels.columns.intersection(zoning_attrs.columns)
+    joined = pd.concat([
+        parcels.iloc[l].rename(columns={c: f"{c}_left" for c in shared}),
+        zoning_attrs.set_axis(parcels.index[l]).rename(columns={c: f"{c}_right" for c in shared})
+    ], axis=1)
+
     if how == "largest":
-        # compute intersection area safely
-        def get_overlap_area(row):
-            if pd.isna(row.index_right):  # no zoning match
-                return 0
-            return row.geometry.intersection(zoning.loc[row.index_right, "geometry"]).area
-        
-        joined["overlap_area"] = joined.apply(get_overlap_area, axis=1)
+        # areas are only meaningful in a projected CRS (see CANONICAL_CRS)
+        if parcels.crs is not None and parcels.crs.is_geographic:
+            raise ValueError("sjoin_parcels_to_zd needs projected data to compare overlap areas")
+
+        # compute intersection areas in vectorized calls
+        # (parcels with no zoning match get an overlap of 0)
+        matched = np.flatnonzero(r >= 0)
+        parcel_arr = parcels.geometry.to_numpy()
+        parcel_areas = shapely.area(parcel_arr)   # once per parcel, not per pair
+        overlap = np.zeros(len(joined))
+        overlap[matched] = overlap_areas(
+            parcel_arr[l[matched]],
+            zoning.geometry.to_numpy(),
+            r[matched],
+            parcel_areas[l[matched]],
+            workers=workers
+        )
+        joined["overlap_area"] = overlap
     
     elif how == "first":
         # keep only the first zoning district encountered per parcel
@@ -177,7 +359,7 @@ def sjoin_parcels_to_zd(parcels, zoning, how="largest"):
     else:
         raise ValueError("how must be 'largest' or 'first'")
     
-    return joined.drop(columns=["index_right"], errors="ignore")
+    return joined
 
 
 
@@ -187,9 +369,13 @@ def sjoin_parcels_to_zd(parcels, zoning, how="largest"):
 # Create a choropleth map that plots a station point and buffer overlays.
 # Can optionally save the figure to a file and add notes at the bottom.
 
-# libraries
-import matplotlib.pyplot as plt
-import mapclassify
+# reproject for display only when not already in NAD83 (EPSG:4269)
+NAD83 = pyproj.CRS.from_epsg(4269)
+
+def _to_nad83(gdf):
+    if same_crs(gdf.crs, NAD83):
+        return gdf
+    return gdf.to_crs(epsg=4269)
 
 # mapping function
 def choropleth_map(
@@ -202,28 +388,43 @@ def choropleth_map(
     cmap="Blues",                           # color scheme
     save=False,                             # save figure
     filename="../output/maps/choropleth_map.pdf", # file name
-    notes=None                              # notes
+    notes=None,                             # notes
+    ax=None,                                # existing axes to draw on
+    bins=None                               # precomputed class breaks
 ):    
     # ensure consistent CRS
-    gdf = gdf.to_crs(epsg=4269)
+    gdf = _to_nad83(gdf)
     if station_gdf is not None:
-        station_gdf = station_gdf.to_crs(epsg=4269)
+        station_gdf = _to_nad83(station_gdf)
     if buffer_gdf is not None:
-        buffer_gdf = buffer_gdf.to_crs(epsg=4269)
+        buffer_gdf = _to_nad83(buffer_gdf)
     
-    fig, ax = plt.subplots(figsize=(10, 10))
+    # draw on the caller's axes when given, clearing the previous map
+    # (lets repeated calls reuse one figure)
+    own_fig = ax is None
+    if own_fig:
+        fig, ax = plt.subplots(figsize=(10, 10))
+    else:
+        fig = ax.figure
+        ax.clear()
     ax.axis("off")
+
+    # class breaks: reuse precomputed bins (e.g. from mapclassify.NaturalBreaks)
+    # so repeated maps of the same column skip reclassifying
+    if bins is None:
+        classification = dict(scheme="NaturalBreaks", k=k)
+    else:
+        classification = dict(scheme="UserDefined", classification_kwds={"bins": list(bins)})
     
     # main choropleth map
     gdf.plot(
         ax=ax,
         column=column,
-        scheme="NaturalBreaks",
-        k=k,
         legend=True,
         cmap=cmap,
         edgecolor="black",
-        linewidth=0.5
+        linewidth=0.5,
+        **classification
     )
     
     # station overlay
@@ -242,31 +443,56 @@ def choropleth_map(
     ax.set_title(title, fontsize=14)
     
     # footnotes 
+    # (anchored to the figure but owned by ax, so clearing ax removes it)
     if notes:
-        fig.text(0.1, 0.01, notes, ha='left', fontsize=10)
+        ax.text(0.1, 0.01, notes, ha='left', fontsize=10, transform=fig.transFigure)
     
     # save
     if save:
-        plt.savefig(filename, format="pdf", bbox_inches="tight")
+        fig.savefig(filename, format="pdf", bbox_inches="tight")
         print(f"Figure saved as {filename}")
 
     
-    plt.show()
-
-
-import geopandas as gpd
-from pygris import tracts, places, validate_state
-from pygris.data import get_census
+    if own_fig:
+        plt.show()
 
 
 # ======================================================
 #  CENSUS EXTRACTION
 # ======================================================
+CENSUS_CACHE_DIR = f"{DATA_ROOT}/census"
+
+#
+# 0. On-disk cache for Census pulls
+# ----------------------------------------
+# (geometry caches pass crs, so a cache stored in another CRS is never reused)
+def census_cache_path(name, state, year, cache_dir=CENSUS_CACHE_DIR, crs=None):
+    suffix = "" if crs is None else f".{crs_tag(crs)}"
+    return os.path.join(cache_dir, f"{name}_{state}_{year}{suffix}.parquet")
+
+
+def _cached_parquet(path, fetch, read=pd.read_parquet):
+    """Read `path` if it exists, otherwise call `fetch()` and save the result there."""
+    if os.path.exists(path):
+        return read(path)
+    df = fetch()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_parquet(path, index=False)
+    return df
+
+
 #
 # 1. Get Census data
 # ----------------------------------------
-def pull_acs_data(state="CA", year=2022):
-    """Pull ACS 5-year data for a given state."""
+def pull_acs_data(state="CA", year=2022, cache_dir=CENSUS_CACHE_DIR):
+    """
+    Pull ACS 5-year data for a given state.
+    Results are cached as parquet in `cache_dir` (None disables caching).
+    """
+    if cache_dir is not None:
+        path = census_cache_path("acs", state, year, cache_dir)
+        return _cached_parquet(path, lambda: pull_acs_data(state, year, cache_dir=None))
+
     acs_vars = {
         "median_age": "B01002_001E",
         "median_income": "B19013_001E",
@@ -356,98 +582,144 @@ def pull_acs_data(state="CA", year=2022):
         return_geoid=True
     )
 
-    # rename
-    df = df.rename(columns={v: k for k, v in acs_vars.items()})
+    # rename by swapping the column labels in place
+    # (DataFrame.rename would copy every column under pandas 2.x)
+    names = {v: k for k, v in acs_vars.items()}
+    df.columns = [names.get(c, c) for c in df.columns]
+
+    # compact dtypes: categorical GEOID and int32 counts; medians, gini and
+    # counts with missing values stay float64 so Census annotation
+    # sentinels (e.g. -666666666) keep their exact values
+    float_cols = ["median_age", "median_income", "median_rent", "gini"]
+    count_cols = [c for c in acs_vars if c not in float_cols]
+    df["GEOID"] = df["GEOID"].astype("category")
+    df = df.astype({c: "int32" for c in count_cols if df[c].notna().all()})
     return df
 
 
 #
 # 2. Create indicators
 # ----------------------------------------
-def compute_acs_indicators(df):
-    """Compute all ACS derived variables (rent burden, poverty, tenure, etc.)."""
 
-    # RENT BURDEN
-    df["rent_burdened_count"] = (
-        df["rent_30_34"] + df["rent_35_39"] +
-        df["rent_40_49"] + df["rent_50_plus"]
-    )
-    df["rent_burdened_pct"] = df["rent_burdened_count"] / df["total_renter_households"] * 100
+# derived counts: new column -> ACS columns summed into it
+ACS_SUMS = {
+    "rent_burdened_count": ["rent_30_34", "rent_35_39", "rent_40_49", "rent_50_plus"],
+    "single_family_units": ["units_1_detached", "units_1_attached"],
+    "small_multifamily_units": ["units_2", "units_3_4"],
+    "medium_multifamily_units": ["units_5_9", "units_10_19"],
+    "large_multifamily_units": ["units_20_49", "units_50_plus"],
+    "other_units": ["units_mobile", "units_other"],
+    "college_plus": ["bachelors", "masters", "professional", "doctorate"],
+}
 
+# percentages: (new column, numerator, denominator)
+ACS_PCTS = [
+    # RENT BURDEN
+    ("rent_burdened_pct", "rent_burdened_count", "total_renter_households"),
     # POVERTY
-    df["poverty_rate"] = df["below_poverty"] / df["poverty_universe"] * 100
-
+    ("poverty_rate", "below_poverty", "poverty_universe"),
     # TENURE
-    df["pct_renters"] = df["renter_occupied"] / df["tenure_total"] * 100
-    df["pct_homeowners"] = df["owner_occupied"] / df["tenure_total"] * 100
-
+    ("pct_renters", "renter_occupied", "tenure_total"),
+    ("pct_homeowners", "owner_occupied", "tenure_total"),
     # TRANSPORTATION
-    df["no_vehicle_pct"] = df["no_vehicle"] / df["total_households"] * 100
-    df["public_transit_pct"] = df["public_transit_total"] / df["total_workers"] * 100
-    df["drove_pct"] = df["drove"] / df["total_workers"] * 100
-    df["bike_pct"] = df["bike"] / df["total_workers"] * 100
-    df["walked_pct"] = df["walked"] / df["total_workers"] * 100
-    df["commuter_rail_pct"] = df["commuter_rail"] / df["total_workers"] * 100
-    df["light_rail_pct"] = df["light_rail"] / df["total_workers"] * 100
-    df["worked_home_pct"] = df["worked_home"] / df["total_workers"] * 100
-
+    ("no_vehicle_pct", "no_vehicle", "total_households"),
+    ("public_transit_pct", "public_transit_total", "total_workers"),
+    ("drove_pct", "drove", "total_workers"),
+    ("bike_pct", "bike", "total_workers"),
+    ("walked_pct", "walked", "total_workers"),
+    ("commuter_rail_pct", "commuter_rail", "total_workers"),
+    ("light_rail_pct", "light_rail", "total_workers"),
+    ("worked_home_pct", "worked_home", "total_workers"),
     # HOUSING STRUCTURE
-    df["single_family_units"] = df["units_1_detached"] + df["units_1_attached"]
-    df["small_multifamily_units"] = df["units_2"] + df["units_3_4"]
-    df["medium_multifamily_units"] = df["units_5_9"] + df["units_10_19"]
-    df["large_multifamily_units"] = df["units_20_49"] + df["units_50_plus"]
-    df["other_units"] = df["units_mobile"] + df["units_other"]
-
-    df["pct_single_family"] = df["single_family_units"] / df["units_total"] * 100
-    df["pct_small_multifamily"] = df["small_multifamily_units"] / df["units_total"] * 100
-    df["pct_medium_multifamily"] = df["medium_multifamily_units"] / df["units_total"] * 100
-    df["pct_large_multifamily"] = df["large_multifamily_units"] / df["units_total"] * 100
-    df["pct_other"] = df["other_units"] / df["units_total"] * 100
-
+    ("pct_single_family", "single_family_units", "units_total"),
+    ("pct_small_multifamily", "small_multifamily_units", "units_total"),
+    ("pct_medium_multifamily", "medium_multifamily_units", "units_total"),
+    ("pct_large_multifamily", "large_multifamily_units", "units_total"),
+    ("pct_other", "other_units", "units_total"),
     # VACANCY
-    df["vacancy_rate"] = df["housing_units_vacant"] / df["housing_units_total"] * 100
-
+    ("vacancy_rate", "housing_units_vacant", "housing_units_total"),
     # RACE / ETHNICITY
-    df["pct_white"] = df["white"] / df["race_total"] * 100
-    df["pct_black"] = df["black"] / df["race_total"] * 100
-    df["pct_asian"] = df["asian"] / df["race_total"] * 100
-    df["pct_latino"] = df["hispanic"] / df["hisp_total"] * 100
-
+    ("pct_white", "white", "race_total"),
+    ("pct_black", "black", "race_total"),
+    ("pct_asian", "asian", "race_total"),
+    ("pct_latino", "hispanic", "hisp_total"),
     # EDUCATION
-    df["college_plus"] = df["bachelors"] + df["masters"] + df["professional"] + df["doctorate"]
-    df["pct_college_plus"] = df["college_plus"] / df["edu_total"] * 100
+    ("pct_college_plus", "college_plus", "edu_total"),
+]
+
+
+def compute_acs_indicators(df):
+    """Compute all ACS derived variables (rent burden, poverty, tenure, etc.)."""
+
+    # DERIVED COUNTS
+    for name, parts in ACS_SUMS.items():
+        df[name] = df[parts].to_numpy(dtype="float64").sum(axis=1)
+
+    # PERCENTAGES
+    # one divide over stacked numerator/denominator arrays; tracts with no
+    # (or a negative, i.e. Census-annotated) denominator get NaN, not inf
+    names, nums, dens = zip(*ACS_PCTS)
+    num = df[list(nums)].to_numpy(dtype="float64")
+    den = df[list(dens)].to_numpy(dtype="float64")
+    pct = np.full(num.shape, np.nan)
+    np.divide(num, den, out=pct, where=den > 0)
+    df[list(names)] = pct * 100
+
+    # STORAGE
+    # percentages don't need float64 precision (median_rent stays float64
+    # so Census annotation sentinels such as -666666666 stay exact)
+    pct_cols = [c for c in df.columns if c.startswith("pct_") or c.endswith(("_pct", "_rate"))]
+    df[pct_cols] = df[pct_cols].astype("float32")
 
     return df
 
 #
 # 3. Pull tracts and places
 # ----------------------------------------
-def pull_tracts(state="CA", year=2022):
-    return tracts(state=state, cb=True, year=year, cache=True)
+def pull_tracts(state="CA", year=2022, cache_dir=CENSUS_CACHE_DIR):
+    if cache_dir is not None:
+        path = census_cache_path("tracts", state, year, cache_dir, crs=CANONICAL_CRS)
+        return _cached_parquet(path, lambda: pull_tracts(state, year, cache_dir=None), read=gpd.read_parquet)
+    return tracts(state=state, cb=True, year=year, cache=True).to_crs(CANONICAL_CRS)
 
 
-def pull_places(state="CA", year=2022):
-    return places(state=state, cb=True, year=year, cache=True)
+def pull_places(state="CA", year=2022, cache_dir=CENSUS_CACHE_DIR):
+    if cache_dir is not None:
+        path = census_cache_path("places", state, year, cache_dir, crs=CANONICAL_CRS)
+        return _cached_parquet(path, lambda: pull_places(state, year, cache_dir=None), read=gpd.read_parquet)
+    return places(state=state, cb=True, year=year, cache=True).to_crs(CANONICAL_CRS)
 
 #
 # 4. Subset tracts to a city
 # ----------------------------------------
 def subset_city_tracts(tracts_gdf, places_gdf, city_name):
     """Subset tracts whose *centroids* fall inside the named city."""
-    city = places_gdf[places_gdf["NAME"] == city_name]
+    if not same_crs(places_gdf.crs, tracts_gdf.crs):
+        places_gdf = places_gdf.to_crs(tracts_gdf.crs)
+    city = places_gdf.loc[places_gdf["NAME"] == city_name, "geometry"].union_all()
+
+    # one point-in-polygon pass over plain centroid x/y arrays
+    # (no centroid column, frame copy or spatial index for a single polygon)
+    centroids = shapely.centroid(tracts_gdf.geometry.to_numpy())
+    inside = shapely.contains_xy(city, shapely.get_x(centroids), shapely.get_y(centroids))
+
+    return tracts_gdf[inside]
 
-    tracts_copy = tracts_gdf.copy()
-    tracts_copy["centroid"] = tracts_copy.centroid
 
-    subset = gpd.sjoin(
-        tracts_copy.set_geometry("centroid"),
-        city,
-        predicate="within"
-    ).drop(columns="geometry")
+def subset_tracts_by_city(tracts_gdf, places_gdf, city_names):
+    """Subset tracts by centroid for several cities, building one centroid STRtree for all."""
+    if not same_crs(places_gdf.crs, tracts_gdf.crs):
+        places_gdf = places_gdf.to_crs(tracts_gdf.crs)
 
-    # restore original geometry
-    subset = subset.set_geometry(tracts_gdf.geometry)
-    return subset
+    # one tree over the tract centroids, queried once per city
+    tree = shapely.STRtree(shapely.centroid(tracts_gdf.geometry.to_numpy()))
+
+    subsets = {}
+    for city_name in city_names:
+        city = places_gdf.loc[places_gdf["NAME"] == city_name, "geometry"].union_all()
+        hits = np.sort(tree.query(city, predicate="contains"))
+        subsets[city_name] = tracts_gdf.iloc[hits]
+    return subsets
 
 
 #
@@ -455,10 +727,13 @@ def subset_city_tracts(tracts_gdf, places_gdf, city_name):
 # ----------------------------------------
 
 def merge_tracts_with_acs(tracts_city, acs_df):
+    # share the ACS categorical GEOID so the merge matches integer codes
+    geoid = acs_df["GEOID"].dtype
+    if isinstance(geoid, pd.CategoricalDtype) and tracts_city["GEOID"].isin(geoid.categories).all():
+        tracts_city = tracts_city.astype({"GEOID": geoid})
     return tracts_city.merge(
         acs_df,
-        left_on="GEOID_left",
-        right_on="GEOID",
+        on="GEOID",
         how="left"
     )
 
@@ -487,6 +762,12 @@ def abbreviate_zoning(code):
         return "Unknown"
     return zoning_abb.get(code.strip(), "Other")
 
+# same lookup for a whole column: strip + map run as vectorized pandas ops
+def abbreviate_zoning_series(codes):
+    if codes.isna().all():   # an all-missing column is float, with no .str
+        return pd.Series("Unknown", index=codes.index, name=codes.name)
+    return codes.str.strip().map(zoning_abb).where(codes.notna(), "Unknown").fillna("Other")
+
 # ======================================================
 #  ZONING CLASSIFICATIONS
 # ======================================================
@@ -598,3 +879,10 @@ def classify_zoning(code):
     if pd.isna(code):
         return "Unknown"
     return zoning_classification.get(code.strip(), "Other")
+
+# same lookup for a whole column: strip + map run as vectorized pandas ops
+def classify_zoning_series(codes):
+    if codes.isna().all():   # an all-missing column is float, with no .str
+        return pd.Series("Unknown", index=codes.index, name=codes.name)
+    return codes.str.strip().map(zoning_classification).where(codes.notna(), "Unknown").fillna("Other")
+